@@ -10,20 +10,109 @@ import os
 import sys
 import json
 import hashlib
+import mmap
+import shutil
+import socket
+import sqlite3
 import time
 import urllib.parse
+import contextlib
+import functools
+import bisect
+import fnmatch
+import re
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple
+from typing import List, Dict, Set, Optional, Tuple, Iterator
 import concurrent.futures
+import multiprocessing
 import threading
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection
 import argparse
 from dataclasses import dataclass
 from datetime import datetime
 
+# Optional SIMD/multithreaded hashing; falls back to hashlib.md5 when not installed
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Optional non-cryptographic hashing for fast change detection
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Optional HTTP/2 client for multiplexed directory listings
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# OpenSSL build behind hashlib.md5; versions before 1.1.1 lack the faster MD5 code paths
+try:
+    import ssl
+    OPENSSL_VERSION_INFO = ssl.OPENSSL_VERSION_INFO
+except ImportError:
+    OPENSSL_VERSION_INFO = None
+
+# Optional C JSON parser; orjson.JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+# Errors raised by the HTTP/2 listing client (empty when httpx is not installed)
+HTTPX_ERRORS = (httpx.HTTPError,) if httpx is not None else ()
+
+# Algorithm tags stored in cache metadata so entries from other algorithms are ignored
+FULL_CHECKSUM_ALGO = "blake3" if blake3 is not None else "md5"
+FAST_CHECKSUM_ALGO = "xxh3_128" if xxhash is not None else f"sampled-{FULL_CHECKSUM_ALGO}"
+
+# Read size for whole-file hashing; large reads amortize per-call Python overhead
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Files at least this large are sampled instead of fully hashed when fast_checksum is on
+FAST_CHECKSUM_MIN_SIZE = 10 * 1024 * 1024
+
+# Files up to this size are hashed from a single read, skipping mmap and buffer setup
+SMALL_FILE_SIZE = 1024 * 1024
+
+# Responses retried with exponential backoff by both HTTP clients
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 1
+
+# Chunk size for streamed uploads
+UPLOAD_CHUNK_SIZE = 256 * 1024  # 256KB
+
+class _CacheFilenameTable(dict):
+    """str.translate table that maps characters unsafe in cache filenames to '_'."""
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        replacement = char if char.isalnum() or char in '._-' else '_'
+        self[codepoint] = replacement
+        return replacement
+
+_CACHE_FILENAME_TABLE = _CacheFilenameTable()
+
+@functools.lru_cache(maxsize=None)
+def create_cache_filename(relative_path: str) -> str:
+    """Create a safe filename for cache storage."""
+    # Path separators aren't alphanumeric, so they become '_' along with other special characters
+    return relative_path.translate(_CACHE_FILENAME_TABLE)
+
+# Decimal (base-10) size units: values at or above each threshold use the next unit
+_SIZE_THRESHOLDS = (1000, 1000 ** 2, 1000 ** 3, 1000 ** 4)
+_SIZE_UNITS = ((1, 'B', ''), (1000, 'KB', '.1f'), (1000 ** 2, 'MB', '.1f'),
+               (1000 ** 3, 'GB', '.1f'), (1000 ** 4, 'TB', '.2f'))
+
 # Configuration
 @dataclass
 class Config:
@@ -34,6 +123,9 @@ class Config:
     excluded_files: List[str] = None
     fast_checksum: bool = True  # Use fast checksums for large files
     parallel_analysis: bool = True  # Use parallel processing for analysis
+    upload_concurrency: int = 8  # Number of files uploaded at the same time
+    analysis_workers: int = 0  # Number of checksum workers (0 = one per CPU core)
+    socket_send_buffer: int = 0  # SO_SNDBUF size in bytes for storage connections (0 = OS default/autotuning)
     
     @classmethod
     def load_from_file(cls, config_file: str = "config.json") -> 'Config':
@@ -72,8 +164,8 @@ class Config:
                         f"Please create the config file in one of these locations or specify the full path."
                     )
             
-            with open(config_file, 'r') as f:
-                config_data = json.load(f)
+            with open(config_file, 'rb') as f:
+                config_data = json_loads(f.read())
             
             # Expand user path for cache_dir
             if 'cache_dir' in config_data:
@@ -90,15 +182,23 @@ class Config:
     def __post_init__(self):
         if self.excluded_files is None:
             self.excluded_files = [".DS_Store", "._.DS_Store", "Thumbs.db", ".AppleDouble"]
+        # Glob patterns are compiled into one regex; plain names stay in a frozenset for constant-time lookups
+        patterns = [name for name in self.excluded_files if any(char in name for char in '*?[')]
+        self.excluded_pattern = re.compile('|'.join(fnmatch.translate(p) for p in patterns)) if patterns else None
+        self.excluded_files = frozenset(name for name in self.excluded_files if name not in patterns)
+
+# Terminal control is only written when stdout is a terminal, not when output is logged or piped
+IS_TTY = sys.stdout.isatty()
+CLEAR_LINE = '\r\033[K' if IS_TTY else '\n'  # Replaces an in-place status line (starts a new line in logs)
 
 # Colors for terminal output
 class Colors:
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[0;33m'
-    RED = '\033[0;31m'
-    BLUE = '\033[0;34m'
-    BOLD = '\033[1m'
-    NC = '\033[0m'  # No Color
+    GREEN = '\033[0;32m' if IS_TTY else ''
+    YELLOW = '\033[0;33m' if IS_TTY else ''
+    RED = '\033[0;31m' if IS_TTY else ''
+    BLUE = '\033[0;34m' if IS_TTY else ''
+    BOLD = '\033[1m' if IS_TTY else ''
+    NC = '\033[0m' if IS_TTY else ''  # No Color
 
 # Statistics tracking
 @dataclass
@@ -109,7 +209,7 @@ class SyncStats:
     files_missing: int = 0
     directories_deleted: int = 0
     total_bytes_uploaded: int = 0
-    total_upload_time: float = 0.0
+    last_upload_end_time: Optional[float] = None # Time when the most recent successful upload finished
     overall_script_start_time: float = 0.0 # Renamed from script_start_time
     first_byte_upload_time: Optional[float] = None # Time when first actual upload activity began
     sync_operations_start_time: Optional[float] = None # Time when sync operations start after confirmation
@@ -117,14 +217,170 @@ class SyncStats:
     def __post_init__(self):
         self.overall_script_start_time = time.time()
 
+# Local file metadata gathered once during the scan
+@dataclass
+class FileEntry:
+    path: str  # Full local path
+    rel: str  # Relative path using '/' separators
+    enc: str  # URL-encoded relative path
+    size: Optional[int] = None  # None if the file couldn't be stat'ed
+    mtime: float = 0.0
+    checksum: Optional[str] = None
+
+def _md5_file_checksum(f) -> str:
+    """Calculate the MD5 checksum of an open file."""
+    if sys.version_info >= (3, 11):
+        # Run the whole read/update loop in C
+        return hashlib.file_digest(f, "md5", _bufsize=HASH_CHUNK_SIZE).hexdigest()
+    
+    # Hash the mapped file with a single update so OpenSSL sees one buffer
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return hashlib.md5(mm).hexdigest()
+
+def compute_file_checksum(filepath: str) -> str:
+    """Calculate BLAKE3 checksum of a file (MD5 if blake3 is not installed). Raises OSError."""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= SMALL_FILE_SIZE:
+            data = f.read()
+            if blake3 is not None:
+                return blake3.blake3(data).hexdigest()
+            return hashlib.md5(data).hexdigest()
+        
+        if blake3 is not None:
+            # Memory-map the file and let blake3 hash it with its own thread pool
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            hasher.update_mmap(filepath)
+            return hasher.hexdigest()
+        
+        return _md5_file_checksum(f)
+
+def compute_file_checksum_xxh3(filepath: str) -> str:
+    """Calculate XXH3-128 checksum of a whole file. Raises OSError."""
+    chunk_size = HASH_CHUNK_SIZE
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= SMALL_FILE_SIZE:
+            return xxhash.xxh3_128(f.read()).hexdigest()
+        
+        if sys.version_info >= (3, 11):
+            # Run the whole read/update loop in C
+            return hashlib.file_digest(f, xxhash.xxh3_128, _bufsize=chunk_size).hexdigest()
+        
+        hasher = xxhash.xxh3_128()
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _sampled_checksum(filepath: str, hasher, file_size: int, mtime: int) -> str:
+    """Hash size + mtime + first/middle/last 64KB chunks of a file with the given hasher."""
+    hasher.update(f"{file_size}:{mtime}".encode())
+    
+    chunk_size = 64 * 1024  # 64KB chunks
+    # Map the file and slice the sampled regions instead of seek + read
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        try:
+            # Only a few pages are touched, so skip kernel readahead
+            if hasattr(mmap, 'MADV_RANDOM'):
+                mm.madvise(mmap.MADV_RANDOM)
+            
+            with memoryview(mm) as view:
+                # First chunk
+                hasher.update(view[:chunk_size])
+                
+                # Middle chunk
+                if file_size > chunk_size * 2:
+                    middle = file_size // 2
+                    hasher.update(view[middle:middle + chunk_size])
+                
+                # Last chunk
+                if file_size > chunk_size:
+                    hasher.update(view[-chunk_size:])
+        finally:
+            mm.close()
+    finally:
+        os.close(fd)
+    
+    return hasher.hexdigest()
+
+def compute_file_checksum_fast(filepath: str) -> str:
+    """Calculate fast checksum using file size + mtime + first/last chunks. Raises OSError."""
+    stat = os.stat(filepath)
+    file_size = stat.st_size
+    
+    # For small files, use full checksum
+    if file_size < FAST_CHECKSUM_MIN_SIZE:
+        if xxhash is not None:
+            return compute_file_checksum_xxh3(filepath)
+        return compute_file_checksum(filepath)
+    
+    # For large files, use size + mtime + sample chunks
+    # Non-cryptographic XXH3 is enough for change detection; BLAKE3 is the next fastest choice
+    if xxhash is not None:
+        hasher = xxhash.xxh3_128()
+    elif blake3 is not None:
+        hasher = blake3.blake3()
+    else:
+        hasher = hashlib.md5()
+    
+    try:
+        return _sampled_checksum(filepath, hasher, file_size, int(stat.st_mtime))
+    except OSError:
+        # Fall back to a full checksum if the file can't be mapped
+        return compute_file_checksum(filepath)
+
+def compute_legacy_checksum(filepath: str, sampled: bool) -> str:
+    """Calculate the MD5 checksum older versions cached (sampled for large files in fast mode). Raises OSError."""
+    stat = os.stat(filepath)
+    if sampled and stat.st_size >= FAST_CHECKSUM_MIN_SIZE:
+        return _sampled_checksum(filepath, hashlib.md5(), stat.st_size, int(stat.st_mtime))
+    
+    with open(filepath, "rb") as f:
+        if stat.st_size <= SMALL_FILE_SIZE:
+            return hashlib.md5(f.read()).hexdigest()
+        return _md5_file_checksum(f)
+
+class SocketOptionsAdapter(HTTPAdapter):
+    """HTTPAdapter that applies extra socket options to every pooled connection."""
+    def __init__(self, socket_options: List[Tuple[int, int, int]], **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
 class BunnyStorageSync:
     def __init__(self, config: Config):
         self.config = config
         self.stats = SyncStats()
         self.session = self._create_session()
+        self.listing_client = self._create_listing_client()
+        self.checksum_algo = FAST_CHECKSUM_ALGO if self.config.fast_checksum else FULL_CHECKSUM_ALGO
+        self.remote_sizes: Dict[str, int] = {}  # Remote file sizes from the last listing
+        
+        # Locks for state shared between concurrent uploads
+        self._stats_lock = threading.Lock()
+        self._output_lock = threading.Lock()
+        
+        # Upload progress counters, rendered by the _progress_loop thread
+        self._upload_progress: Dict[str, Tuple[int, int]] = {}  # relative_path -> (file_size, bytes_sent)
+        self._upload_files_done = 0
+        self._upload_files_total = 0
+        self._upload_total_bytes = 0
+        self._progress_length = 0
+        self._analysis_done = 0  # Files analyzed so far, rendered by _analysis_progress_loop
         
         # Ensure cache directory exists
         Path(self.config.cache_dir).mkdir(parents=True, exist_ok=True)
+        
+        # SQLite checksum cache, opened on first use
+        self._cache_db: Optional[sqlite3.Connection] = None
+        self._cache_lock = threading.RLock()
+        self._legacy_cache: Dict[str, Dict] = {}
+        self._cache_rows: Optional[Dict[str, Dict]] = None  # In-memory snapshot, see load_cache()
     
     def _create_session(self) -> requests.Session:
         """Create a requests session with retry strategy and proper headers."""
@@ -132,11 +388,18 @@ class BunnyStorageSync:
         
         # Set up retry strategy
         retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=list(RETRY_STATUS_CODES),
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Size the connection pool for concurrent directory listings and uploads
+        pool_size = max(32, self.config.upload_concurrency)
+        # Keep urllib3's defaults (TCP_NODELAY) and probe idle keep-alive connections
+        socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        if self.config.socket_send_buffer > 0:
+            # A fixed send buffer disables the kernel's autotuning, so it's opt-in
+            socket_options.append((socket.SOL_SOCKET, socket.SO_SNDBUF, self.config.socket_send_buffer))
+        adapter = SocketOptionsAdapter(socket_options, max_retries=retry_strategy, pool_connections=pool_size, pool_maxsize=pool_size)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -148,6 +411,49 @@ class BunnyStorageSync:
         
         return session
     
+    def _create_listing_client(self):
+        """Create an HTTP/2 client for directory listings, or None if httpx/h2 are unavailable."""
+        if httpx is None:
+            return None
+        
+        # httpx ignores proxy variables once a transport is passed, so leave proxied setups to requests
+        if requests.utils.get_environ_proxies(self.config.bunny_storage_url):
+            return None
+        
+        # Trust the same CA bundle as the requests session
+        ca_bundle = os.environ.get('REQUESTS_CA_BUNDLE') or os.environ.get('CURL_CA_BUNDLE')
+        verify = True
+        if ca_bundle:
+            try:
+                if os.path.isdir(ca_bundle):
+                    verify = ssl.create_default_context(capath=ca_bundle)
+                else:
+                    verify = ssl.create_default_context(cafile=ca_bundle)
+            except (OSError, ssl.SSLError):
+                # Let requests report the unusable bundle
+                return None
+        
+        try:
+            # All concurrent listings share one multiplexed connection; the transport only
+            # retries failed connects, status retries are handled in _get_listing()
+            transport = httpx.HTTPTransport(
+                http2=True,
+                verify=verify,
+                retries=MAX_RETRIES,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            )
+            return httpx.Client(
+                transport=transport,
+                timeout=30.0,
+                headers={
+                    'AccessKey': self.config.bunny_api_key,
+                    'User-Agent': f'BunnyHop/{__version__}'
+                }
+            )
+        except ImportError:
+            # httpx is installed without the h2 package
+            return None
+    
     def print_msg(self, message: str, color: str = Colors.NC):
         """Print formatted message with timestamp."""
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -155,14 +461,18 @@ class BunnyStorageSync:
     
     def clear_line(self):
         """Clear the current line properly, handling line wrapping."""
+        if not IS_TTY:
+            return
         # Move cursor to beginning of line and clear entire line
         print('\r\033[K', end='', flush=True)
     
-    def clear_progress_lines(self, text_length: int):
+    def clear_progress_lines(self, text_length: int, terminal_width: Optional[int] = None):
         """Clear multiple lines that may have been created by text wrapping."""
+        if not IS_TTY:
+            return
         try:
-            import shutil
-            terminal_width = shutil.get_terminal_size().columns
+            if terminal_width is None:
+                terminal_width = shutil.get_terminal_size().columns
             # Calculate how many lines the text would span
             lines_used = (text_length + terminal_width - 1) // terminal_width
             
@@ -187,44 +497,26 @@ class BunnyStorageSync:
     
     def should_exclude(self, filename: str) -> bool:
         """Check if a file should be excluded from sync."""
-        basename = os.path.basename(filename)
-        return basename in self.config.excluded_files
+        name = filename.rpartition('/')[2]
+        if name in self.config.excluded_files:
+            return True
+        return self.config.excluded_pattern is not None and self.config.excluded_pattern.match(name) is not None
     
     def format_size(self, bytes_size: int) -> str:
         """Convert bytes to human-readable format using decimal (base-10) units."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_size < 1000:
-                if unit == 'B':
-                    return f"{bytes_size}{unit}"
-                return f"{bytes_size:.1f}{unit}"
-            bytes_size /= 1000
-        return f"{bytes_size:.2f}TB"
+        # Pick the unit with a single threshold lookup instead of repeated division
+        divisor, unit, spec = _SIZE_UNITS[bisect.bisect_right(_SIZE_THRESHOLDS, bytes_size)]
+        if divisor == 1:
+            return f"{bytes_size}{unit}"
+        return f"{bytes_size / divisor:{spec}}{unit}"
     
     def calc_speed(self, bytes_size: int, duration: float) -> str:
         """Calculate upload speed using decimal (base-10) units."""
         if duration <= 0:
             return "0.00 MB/s"
-        speed = bytes_size / duration / 1000 / 1000
+        speed = bytes_size / (duration * 1_000_000)
         return f"{speed:.2f} MB/s"
     
-    def format_time_remaining(self, bytes_remaining: int, current_speed_bps: float) -> str:
-        """Calculate and format estimated time remaining."""
-        if current_speed_bps <= 0:
-            return "calculating..."
-        
-        seconds_remaining = bytes_remaining / current_speed_bps
-        
-        if seconds_remaining < 60:
-            return f"{seconds_remaining:.0f}s"
-        elif seconds_remaining < 3600:
-            minutes = int(seconds_remaining // 60)
-            seconds = int(seconds_remaining % 60)
-            return f"{minutes:02d}m:{seconds:02d}s"
-        else:
-            hours = int(seconds_remaining // 3600)
-            minutes = int((seconds_remaining % 3600) // 60)
-            return f"{hours}h:{minutes:02d}m"
-    
     def calculate_total_time_remaining(self, files_completed: int, total_files: int, bytes_completed_script: int, total_bytes_script: int) -> str:
         """Calculate total script time remaining based on overall progress."""
         if total_bytes_script <= 0 or bytes_completed_script < 0: # Allow bytes_completed_script to be 0
@@ -273,170 +565,304 @@ class BunnyStorageSync:
             return f"{hours}h:{minutes:02d}m"
     
     def get_file_checksum(self, filepath: str) -> Optional[str]:
-        """Calculate MD5 checksum of a file with optimized chunk size."""
+        """Calculate BLAKE3 checksum of a file (MD5 if blake3 is not installed)."""
         try:
-            hash_md5 = hashlib.md5()
-            # Use larger chunk size for better performance on large files
-            chunk_size = 1024 * 1024  # 1MB chunks
-            with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(chunk_size), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except (FileNotFoundError, OSError, PermissionError) as e:
+            return compute_file_checksum(filepath)
+        except OSError as e:
             self.print_msg(f"Warning: Cannot read file for checksum '{filepath}': {e}", Colors.YELLOW)
             return None
     
     def get_file_checksum_fast(self, filepath: str) -> Optional[str]:
         """Calculate fast checksum using file size + mtime + first/last chunks."""
         try:
-            stat = os.stat(filepath)
-            file_size = stat.st_size
-            mtime = int(stat.st_mtime)
-            
-            # For small files, use full checksum
-            if file_size < 10 * 1024 * 1024:  # 10MB
-                return self.get_file_checksum(filepath)
-            
-            # For large files, use size + mtime + sample chunks
-            hash_md5 = hashlib.md5()
-            hash_md5.update(f"{file_size}:{mtime}".encode())
-            
-            chunk_size = 64 * 1024  # 64KB chunks
-            with open(filepath, "rb") as f:
-                # Read first chunk
-                first_chunk = f.read(chunk_size)
-                hash_md5.update(first_chunk)
-                
-                # Read middle chunk
-                if file_size > chunk_size * 2:
-                    f.seek(file_size // 2)
-                    middle_chunk = f.read(chunk_size)
-                    hash_md5.update(middle_chunk)
-                
-                # Read last chunk
-                if file_size > chunk_size:
-                    f.seek(-chunk_size, 2)
-                    last_chunk = f.read(chunk_size)
-                    hash_md5.update(last_chunk)
-            
-            return hash_md5.hexdigest()
-        except (FileNotFoundError, OSError, PermissionError) as e:
+            return compute_file_checksum_fast(filepath)
+        except OSError as e:
             self.print_msg(f"Warning: Cannot read file for fast checksum '{filepath}': {e}", Colors.YELLOW)
-            # Try fallback to full checksum
-            return self.get_file_checksum(filepath)
+            return None
         except Exception as e:
             self.print_msg(f"Warning: Unexpected error calculating checksum for '{filepath}': {e}", Colors.YELLOW)
             return None
     
-    def create_cache_filename(self, relative_path: str) -> str:
-        """Create a safe filename for cache storage."""
-        # Replace path separators and special characters
-        safe_name = relative_path.replace('/', '_').replace('\\', '_')
-        # Keep only alphanumeric, period, underscore, and dash
-        result = ''.join(c if c.isalnum() or c in '._-' else '_' for c in safe_name)
-        return result
+    def _get_cache_db(self) -> sqlite3.Connection:
+        """Open the SQLite checksum cache on first use."""
+        with self._cache_lock:
+            if self._cache_db is None:
+                db = sqlite3.connect(str(Path(self.config.cache_dir) / "cache.db"), isolation_level=None, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, checksum TEXT, algo TEXT)"
+                )
+                # Entries from the old per-file cache, keyed by their lossy safe filename
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS legacy ("
+                    "name TEXT PRIMARY KEY, size INTEGER, mtime REAL, checksum TEXT, algo TEXT)"
+                )
+                self._cache_db = db
+                self._migrate_cache()
+                self._legacy_cache = {
+                    name: {'size': size, 'mtime': mtime, 'checksum': checksum, 'algo': algo}
+                    for name, size, mtime, checksum, algo in db.execute("SELECT name, size, mtime, checksum, algo FROM legacy")
+                }
+            return self._cache_db
+    
+    @contextlib.contextmanager
+    def cache_transaction(self):
+        """Group cache writes into a single SQLite transaction."""
+        db = self._get_cache_db()
+        with self._cache_lock:
+            db.execute("BEGIN")
+        try:
+            yield
+        finally:
+            with self._cache_lock:
+                db.execute("COMMIT")
     
     def get_cached_checksum(self, relative_path: str) -> Optional[str]:
         """Get cached checksum for a file."""
-        cache_filename = self.create_cache_filename(relative_path)
-        cache_file = Path(self.config.cache_dir) / f"{cache_filename}.md5"
-        
-        try:
-            if cache_file.exists():
-                return cache_file.read_text().strip()
-        except Exception:
-            pass
+        cached_meta = self.get_cached_metadata(relative_path)
+        if cached_meta:
+            return cached_meta['checksum']
         return None
     
     def get_cached_metadata(self, relative_path: str) -> Optional[Dict]:
-        """Get cached file metadata (size, mtime)."""
-        cache_filename = self.create_cache_filename(relative_path)
-        cache_file = Path(self.config.cache_dir) / f"{cache_filename}.meta"
-        
+        """Get cached file metadata (size, mtime), ignoring entries from other checksum algorithms."""
         try:
-            if cache_file.exists():
-                return json.loads(cache_file.read_text())
+            if self._cache_rows is not None:
+                metadata = self._cache_rows.get(relative_path)
+            else:
+                db = self._get_cache_db()
+                with self._cache_lock:
+                    row = db.execute("SELECT size, mtime, checksum, algo FROM cache WHERE path = ?", (relative_path,)).fetchone()
+                metadata = {'size': row[0], 'mtime': row[1], 'checksum': row[2], 'algo': row[3]} if row else None
+            
+            if metadata is None:
+                # Fall back to an entry imported from the old per-file cache
+                legacy_key = create_cache_filename(relative_path)
+                metadata = self._legacy_cache.get(legacy_key)
+                if metadata and metadata.get('algo') == self.checksum_algo:
+                    self._save_cache_row(relative_path, metadata['size'], metadata['mtime'], metadata['checksum'])
+                    self.drop_legacy_entry(relative_path)
+            
+            if metadata and metadata.get('algo') == self.checksum_algo:
+                return metadata
         except Exception:
             pass
         return None
     
-    def save_metadata_to_cache(self, relative_path: str, file_path: str, checksum: str):
-        """Save file metadata and checksum to cache."""
+    def load_cache(self):
+        """Load all cache rows for the current checksum algorithm into memory with one query."""
         try:
+            db = self._get_cache_db()
+            with self._cache_lock:
+                rows = db.execute("SELECT path, size, mtime, checksum FROM cache WHERE algo = ?", (self.checksum_algo,)).fetchall()
+        except sqlite3.Error as e:
+            self.print_msg(f"Warning: Could not load cache: {e}", Colors.YELLOW)
+            return
+        
+        self._cache_rows = {
+            path: {'size': size, 'mtime': mtime, 'checksum': checksum, 'algo': self.checksum_algo}
+            for path, size, mtime, checksum in rows
+        }
+    
+    def _save_cache_row(self, relative_path: str, size: int, mtime: float, checksum: str):
+        """Insert or replace a single cache row."""
+        db = self._get_cache_db()
+        with self._cache_lock:
+            db.execute(
+                "INSERT OR REPLACE INTO cache (path, size, mtime, checksum, algo) VALUES (?, ?, ?, ?, ?)",
+                (relative_path, size, mtime, checksum, self.checksum_algo)
+            )
+            if self._cache_rows is not None:
+                self._cache_rows[relative_path] = {'size': size, 'mtime': mtime, 'checksum': checksum, 'algo': self.checksum_algo}
+    
+    def save_metadata_to_cache(self, relative_path: str, file_path: str, checksum: str, entry: Optional[FileEntry] = None):
+        """Save file metadata and checksum to cache, reusing the scan's stat when available."""
+        try:
+            if entry is not None and entry.size is not None:
+                self._save_cache_row(relative_path, entry.size, entry.mtime, checksum)
+                return
             stat = os.stat(file_path)
-            metadata = {
-                'size': stat.st_size,
-                'mtime': stat.st_mtime,
-                'checksum': checksum
-            }
-            
-            cache_filename = self.create_cache_filename(relative_path)
-            cache_file = Path(self.config.cache_dir) / f"{cache_filename}.meta"
-            cache_file.write_text(json.dumps(metadata))
-            
-            # Also save the checksum file for backward compatibility
-            self.save_checksum_to_cache(relative_path, checksum)
+            self._save_cache_row(relative_path, stat.st_size, stat.st_mtime, checksum)
         except Exception as e:
             self.print_msg(f"Warning: Could not save metadata to cache: {e}", Colors.YELLOW)
     
-    def file_needs_checksum(self, relative_path: str, file_path: str) -> bool:
+    def file_needs_checksum(self, relative_path: str, file_path: str, entry: Optional[FileEntry] = None) -> bool:
         """Check if file needs checksum calculation based on metadata."""
         try:
             cached_meta = self.get_cached_metadata(relative_path)
             if not cached_meta:
                 return True
             
-            current_stat = os.stat(file_path)
+            # Reuse the stat from the local scan when available
+            if entry is not None and entry.size is not None:
+                current_size, current_mtime = entry.size, entry.mtime
+            else:
+                current_stat = os.stat(file_path)
+                current_size, current_mtime = current_stat.st_size, current_stat.st_mtime
             
             # Check if size or mtime changed
-            if (cached_meta.get('size') != current_stat.st_size or 
-                abs(cached_meta.get('mtime', 0) - current_stat.st_mtime) > 1):
+            if (cached_meta.get('size') != current_size or 
+                abs(cached_meta.get('mtime', 0) - current_mtime) > 1):
                 return True
             
             return False
         except Exception:
             return True
     
-    def save_checksum_to_cache(self, relative_path: str, checksum: str):
-        """Save checksum to cache."""
-        cache_filename = self.create_cache_filename(relative_path)
-        cache_file = Path(self.config.cache_dir) / f"{cache_filename}.md5"
+    def _legacy_entry_changed(self, entry: FileEntry) -> bool:
+        """Compare a file against its imported old-format cache entry. Returns True if the file changed since."""
+        metadata = self._legacy_cache.get(create_cache_filename(entry.rel))
+        if not metadata:
+            return False
         
         try:
-            cache_file.write_text(checksum)
-        except Exception as e:
-            self.print_msg(f"Warning: Could not save checksum to cache: {e}", Colors.YELLOW)
+            stat = os.stat(entry.path)
+            changed = not (metadata.get('size') == stat.st_size and abs(metadata.get('mtime', 0) - stat.st_mtime) <= 1)
+            if changed:
+                changed = compute_legacy_checksum(entry.path, metadata.get('algo') == "sampled-md5") != metadata.get('checksum')
+        except OSError:
+            # Can't prove the remote copy is current, so upload it
+            return True
+        
+        # A changed file keeps its entry until it is uploaded, so dry runs and interrupted runs don't lose it
+        if not changed:
+            self.drop_legacy_entry(entry.rel)
+        return changed
+    
+    def drop_legacy_entry(self, relative_path: str):
+        """Remove a file's imported old-format cache entry once it is no longer needed."""
+        legacy_key = create_cache_filename(relative_path)
+        if self._legacy_cache.pop(legacy_key, None) is None:
+            return
+        try:
+            db = self._get_cache_db()
+            with self._cache_lock:
+                db.execute("DELETE FROM legacy WHERE name = ?", (legacy_key,))
+        except sqlite3.Error:
+            pass
     
     def remove_from_cache(self, relative_path: str):
         """Remove checksum from cache."""
-        cache_filename = self.create_cache_filename(relative_path)
-        cache_file = Path(self.config.cache_dir) / f"{cache_filename}.md5"
-        
         try:
-            if cache_file.exists():
-                cache_file.unlink()
+            db = self._get_cache_db()
+            with self._cache_lock:
+                db.execute("DELETE FROM cache WHERE path = ?", (relative_path,))
+                if self._cache_rows is not None:
+                    self._cache_rows.pop(relative_path, None)
         except Exception:
             pass
     
+    def _migrate_cache(self):
+        """Move the old per-file .meta/.md5 cache files into the legacy table."""
+        try:
+            with os.scandir(self.config.cache_dir) as entries:
+                legacy_names = [entry.name for entry in entries if entry.name.endswith(('.meta', '.md5'))]
+        except OSError:
+            return
+        
+        if not legacy_names:
+            return
+        
+        rows = []
+        for name in legacy_names:
+            if not name.endswith('.meta'):
+                continue
+            try:
+                with open(os.path.join(self.config.cache_dir, name), 'rb') as f:
+                    metadata = json_loads(f.read())
+                # Old entries carry no algo; they were always MD5, sampled when fast_checksum was on
+                algo = metadata.get('algo') or ("sampled-md5" if self.config.fast_checksum else "md5")
+                rows.append((name[:-5], metadata['size'], metadata['mtime'], metadata['checksum'], algo))
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        
+        # Commit the imported rows before removing any file, so an interrupted run can't lose them;
+        # re-importing files that survive a crash is harmless
+        db = self._cache_db
+        try:
+            db.execute("BEGIN")
+            db.executemany("INSERT OR REPLACE INTO legacy (name, size, mtime, checksum, algo) VALUES (?, ?, ?, ?, ?)", rows)
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            return
+        
+        for name in legacy_names:
+            try:
+                os.remove(os.path.join(self.config.cache_dir, name))
+            except OSError:
+                pass
+    
     def get_remote_files(self, current_path: str = "") -> Tuple[Set[str], Set[str]]:
         """Get all remote files and directories recursively."""
         remote_files = set()
         remote_directories = set()
         total_remote_size = 0
+        self.remote_sizes = {}
         
         print("  Fetching remote file list...", end='', flush=True)
         
         try:
             total_remote_size = self._get_remote_files_recursive(current_path, remote_files, remote_directories, total_remote_size)
-            print(f"\r\033[K  ✓ Found {len(remote_files)} remote files in {len(remote_directories)} directories ({self.format_size(total_remote_size)})")
+            print(f"{CLEAR_LINE}  ✓ Found {len(remote_files)} remote files in {len(remote_directories)} directories ({self.format_size(total_remote_size)})")
         except Exception as e:
-            print(f"\r\033[K  ✗ Error getting remote files: {e}")
+            # A partial listing would make missing directories look empty, so don't return one
+            print(f"{CLEAR_LINE}  ✗ Error getting remote files: {e}")
             self.print_msg(f"Error getting remote files: {e}", Colors.RED)
+            raise
         
         return remote_files, remote_directories
     
     def _get_remote_files_recursive(self, current_path: str, remote_files: Set[str], remote_directories: Set[str], total_size: int = 0) -> int:
-        """Recursively get remote files and directories from a directory."""
+        """Get remote files and directories below a directory, listing subdirectories concurrently."""
+        # Walk the tree breadth-first so sibling directories are fetched in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+            pending = {executor.submit(self._list_remote_directory, current_path)}
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        files, directories, size = future.result()
+                    except BaseException:
+                        # Don't start listings that are still queued
+                        for queued in pending:
+                            queued.cancel()
+                        raise
+                    remote_files.update(files)
+                    self.remote_sizes.update(files)
+                    total_size += size
+                    
+                    for dir_path in directories:
+                        remote_directories.add(dir_path)
+                        pending.add(executor.submit(self._list_remote_directory, dir_path))
+        
+        return total_size
+    
+    def _get_listing(self, url: str):
+        """GET a directory listing, retrying rate limits and server errors like the requests session does."""
+        if self.listing_client is None:
+            return self.session.get(url, timeout=30)
+        
+        for attempt in range(MAX_RETRIES + 1):
+            response = self.listing_client.get(url)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                return response
+            
+            # Honor Retry-After when the server sends seconds, otherwise back off exponentially
+            retry_after = response.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else RETRY_BACKOFF_FACTOR * (2 ** attempt)
+            time.sleep(delay)
+    
+    def _list_remote_directory(self, current_path: str) -> Tuple[Dict[str, int], List[str], int]:
+        """List a single remote directory. Returns ({file_path: size}, directory_paths, total_file_size).
+        Raises on errors so a failed listing is never mistaken for an empty directory."""
+        files = {}
+        directories = []
+        total_size = 0
+        
         # Construct API URL
         if current_path:
             if not current_path.endswith('/'):
@@ -446,12 +872,17 @@ class BunnyStorageSync:
             url = f"{self.config.bunny_storage_url}/"
         
         try:
-            response = self.session.get(url, timeout=30)
+            response = self._get_listing(url)
+            
+            if response.status_code == 404:
+                # Directory doesn't exist, which is fine
+                return files, directories, total_size
             response.raise_for_status()
             
-            items = response.json()
+            # Parse the raw body directly (orjson when available)
+            items = json_loads(response.content)
             if not isinstance(items, list):
-                return total_size
+                return files, directories, total_size
             
             for item in items:
                 object_name = item.get('ObjectName', '')
@@ -461,35 +892,26 @@ class BunnyStorageSync:
                     continue
                 
                 if is_directory:
-                    # Add directory to the set
-                    dir_path = f"{current_path}{object_name}"
-                    remote_directories.add(dir_path)
-                    
-                    # Recursively get files from subdirectory
-                    total_size = self._get_remote_files_recursive(dir_path, remote_files, remote_directories, total_size)
+                    # Subdirectory - listed by the caller
+                    directories.append(f"{current_path}{object_name}")
                 else:
-                    # Add file to the set
-                    full_path = f"{current_path}{object_name}"
-                    remote_files.add(full_path)
-                    
-                    # Add file size to total (if available)
-                    file_size = item.get('Length', 0)
-                    if isinstance(file_size, (int, float)) and file_size > 0:
+                    # Record the file size (-1 if not available) and add it to the total
+                    file_size = item.get('Length', -1)
+                    if not isinstance(file_size, (int, float)):
+                        file_size = -1
+                    files[f"{current_path}{object_name}"] = int(file_size)
+                    if file_size > 0:
                         total_size += int(file_size)
                     
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response is not None:
-                if e.response.status_code == 404:
-                    # Directory doesn't exist, which is fine
-                    return total_size
+        except (requests.exceptions.RequestException, *HTTPX_ERRORS, ValueError) as e:
             self.print_msg(f"Error fetching directory '{current_path}': {e}", Colors.RED)
+            raise
         
-        return total_size
+        return files, directories, total_size
     
     def remote_file_exists(self, relative_path: str) -> bool:
         """Check if file exists on remote server."""
-        encoded_path = urllib.parse.quote(relative_path, safe='/')
-        url = f"{self.config.bunny_storage_url}/{encoded_path}"
+        url = f"{self.config.bunny_storage_url}/{urllib.parse.quote(relative_path, safe='/')}"
         
         try:
             response = self.session.head(url, timeout=10)
@@ -497,32 +919,29 @@ class BunnyStorageSync:
         except requests.exceptions.RequestException:
             return False
     
-    def upload_file(self, local_path: str, relative_path: str, file_index: int = 0, total_files: int = 0, total_upload_size: int = 0) -> bool:
-        """Upload a single file to Bunny Storage with total script progress tracking."""
+    def upload_file(self, local_path: str, relative_path: str, encoded_path: Optional[str] = None) -> bool:
+        """Upload a single file to Bunny Storage, publishing progress for the reporter thread."""
         try:
             file_size = os.path.getsize(local_path)
             
-            # URL encode the remote path
-            encoded_path = urllib.parse.quote(relative_path, safe='/')
+            # URL encode the remote path (precomputed during the local scan when available)
+            if encoded_path is None:
+                encoded_path = urllib.parse.quote(relative_path, safe='/')
             url = f"{self.config.bunny_storage_url}/{encoded_path}"
             
             upload_start = time.time() # Marks the start of attempting to upload *this* file
 
             # Set first_byte_upload_time if this is the very first upload activity of the script
             # and the file has content.
-            if self.stats.first_byte_upload_time is None and file_size > 0:
-                if self.stats.files_uploaded == 0: # No prior files have *completed* uploading.
-                    self.stats.first_byte_upload_time = upload_start
+            with self._stats_lock:
+                if self.stats.first_byte_upload_time is None and file_size > 0:
+                    if self.stats.files_uploaded == 0: # No prior files have *completed* uploading.
+                        self.stats.first_byte_upload_time = upload_start
             
-            # Measure upload time
-            last_progress_length = 0
+            self._upload_progress[relative_path] = (file_size, 0)
             
-            # For small files (< 1MB), don't show progress percentage
-            if file_size < 1024 * 1024:
-                progress_msg = f"  Uploading: {relative_path} ({self.format_size(file_size)})"
-                print(progress_msg, end='', flush=True)
-                last_progress_length = len(progress_msg)
-                
+            # For small files, send the file object directly
+            if file_size <= 10 * UPLOAD_CHUNK_SIZE:
                 with open(local_path, 'rb') as f:
                     response = self.session.put(
                         url,
@@ -531,54 +950,21 @@ class BunnyStorageSync:
                         timeout=300
                     )
             else:
-                # For larger files, show progress
-                uploaded_bytes = 0
-                last_progress_time = upload_start
-                
-                initial_msg = f"  Uploading: {relative_path} ({self.format_size(file_size)}) - 0.0%"
-                print(initial_msg, end='', flush=True)
-                last_progress_length = len(initial_msg)
-                
                 def file_generator():
-                    nonlocal uploaded_bytes, last_progress_time, last_progress_length
+                    # Slice a read-only mapping instead of seek + read; chunks must be bytes
+                    # because urllib3 1.26 encodes anything else as text
                     with open(local_path, 'rb') as f:
-                        while True:
-                            chunk = f.read(262144)
-                            if not chunk:
-                                break
+                        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    uploaded_bytes = 0
+                    try:
+                        for offset in range(0, len(mm), UPLOAD_CHUNK_SIZE):
+                            chunk = mm[offset:offset + UPLOAD_CHUNK_SIZE]
                             uploaded_bytes += len(chunk)
-                            current_time = time.time()
-                            
-                            # Update progress every 0.5 seconds
-                            if current_time - last_progress_time >= 0.5:
-                                progress_percent = (uploaded_bytes / file_size) * 100
-                                elapsed = current_time - upload_start
-                                if elapsed > 0:
-                                    speed_mbps = uploaded_bytes / elapsed / 1000 / 1000  # MB/s
-                                    
-                                    # Calculate total script time remaining
-                                    if total_files > 0 and total_upload_size > 0:
-                                        files_completed = file_index
-                                        bytes_completed = self.stats.total_bytes_uploaded + uploaded_bytes
-                                        total_time_remaining = self.calculate_total_time_remaining(files_completed, total_files, bytes_completed, total_upload_size)
-                                        display_path = self.truncate_path(relative_path, 40)
-                                        progress_msg = f"  Uploading: {display_path} ({self.format_size(file_size)}) - {progress_percent:.1f}% ({speed_mbps:.2f} MB/s, {total_time_remaining} total remaining)"
-                                    else:
-                                        # Fallback to individual file time remaining
-                                        speed_bps = uploaded_bytes / elapsed  # bytes/s
-                                        bytes_remaining = file_size - uploaded_bytes
-                                        time_remaining = self.format_time_remaining(bytes_remaining, speed_bps)
-                                        display_path = self.truncate_path(relative_path, 40)
-                                        progress_msg = f"  Uploading: {display_path} ({self.format_size(file_size)}) - {progress_percent:.1f}% ({speed_mbps:.2f} MB/s, {time_remaining} remaining)"
-                                    
-                                    # Clear previous progress lines and print new one
-                                    self.clear_progress_lines(last_progress_length)
-                                    print(progress_msg, end='', flush=True)
-                                    last_progress_length = len(progress_msg)
-                                    
-                                last_progress_time = current_time
-                            
+                            # Only publish the counter; the reporter thread does the formatting and printing
+                            self._upload_progress[relative_path] = (file_size, uploaded_bytes)
                             yield chunk
+                    finally:
+                        mm.close()
                 
                 response = self.session.put(
                     url,
@@ -592,31 +978,110 @@ class BunnyStorageSync:
             
             if response.status_code in (200, 201):
                 # Update statistics
-                self.stats.files_uploaded += 1
-                self.stats.total_bytes_uploaded += file_size
-                self.stats.total_upload_time += upload_duration
+                with self._stats_lock:
+                    self.stats.files_uploaded += 1
+                    self.stats.total_bytes_uploaded += file_size
+                    self.stats.last_upload_end_time = max(self.stats.last_upload_end_time or 0.0, upload_end)
+                    self._upload_progress.pop(relative_path, None)
                 
                 upload_speed = self.calc_speed(file_size, upload_duration)
                 # Clear the progress lines completely and print success message
-                self.clear_progress_lines(last_progress_length)
-                print(f"  {Colors.GREEN}✓ Uploaded: {relative_path} ({self.format_size(file_size)}) - {upload_speed}{Colors.NC}")
+                with self._output_lock:
+                    self.clear_progress_lines(self._progress_length)
+                    self._progress_length = 0
+                    print(f"  {Colors.GREEN}✓ Uploaded: {relative_path} ({self.format_size(file_size)}) - {upload_speed}{Colors.NC}")
                 
                 return True
             else:
-                self.clear_progress_lines(last_progress_length)
-                print(f"  ✗ Upload failed: {relative_path} (HTTP {response.status_code})")
+                with self._output_lock:
+                    self.clear_progress_lines(self._progress_length)
+                    self._progress_length = 0
+                    print(f"  ✗ Upload failed: {relative_path} (HTTP {response.status_code})")
                 return False
                 
         except Exception as e:
-            self.clear_progress_lines(last_progress_length)
-            print(f"  ✗ Upload failed: {relative_path} - {e}")
+            with self._output_lock:
+                self.clear_progress_lines(self._progress_length)
+                self._progress_length = 0
+                print(f"  ✗ Upload failed: {relative_path} - {e}")
             return False
+        finally:
+            self._upload_progress.pop(relative_path, None)
+    
+    def upload_many(self, items: List[FileEntry], total_upload_size: int = 0, max_workers: int = 8) -> Iterator[Tuple[str, bool]]:
+        """Upload local files concurrently. Yields (relative_path, success) as uploads finish."""
+        self._upload_progress = {}
+        self._upload_files_done = 0
+        self._upload_files_total = len(items)
+        self._upload_total_bytes = total_upload_size
+        
+        # Progress is drawn off the upload threads
+        stop_event = threading.Event()
+        reporter = threading.Thread(target=self._progress_loop, args=(stop_event,), daemon=True)
+        reporter.start()
+        
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        future_to_file = {
+            executor.submit(self.upload_file, entry.path, entry.rel, entry.enc): entry.rel
+            for entry in items
+        }
+        try:
+            for future in concurrent.futures.as_completed(future_to_file):
+                self._upload_files_done += 1
+                yield future_to_file[future], future.result()
+        except BaseException:
+            # Don't start queued uploads after an interrupt or error
+            for future in future_to_file:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            stop_event.set()
+            reporter.join()
+            with self._output_lock:
+                self.clear_progress_lines(self._progress_length)
+                self._progress_length = 0
+    
+    def _progress_loop(self, stop_event: threading.Event):
+        """Redraw the upload progress line every 0.5 seconds until stop_event is set."""
+        if not IS_TTY:
+            return
+        terminal_width = shutil.get_terminal_size().columns
+        
+        while not stop_event.wait(0.5):
+            progress_msg = self._format_upload_progress()
+            if progress_msg is None:
+                continue
+            
+            with self._output_lock:
+                self.clear_progress_lines(self._progress_length, terminal_width)
+                print(progress_msg, end='', flush=True)
+                self._progress_length = len(progress_msg)
+    
+    def _format_upload_progress(self) -> Optional[str]:
+        """Build the progress line for the uploads currently in flight."""
+        in_flight = dict(self._upload_progress)
+        if not in_flight or self.stats.first_byte_upload_time is None:
+            return None
+        
+        bytes_completed = self.stats.total_bytes_uploaded + sum(sent for _, sent in in_flight.values())
+        elapsed = time.time() - self.stats.first_byte_upload_time
+        speed_mbps = bytes_completed / elapsed / 1000 / 1000 if elapsed > 0 else 0.0  # MB/s
+        total_time_remaining = self.calculate_total_time_remaining(self._upload_files_done, self._upload_files_total, bytes_completed, self._upload_total_bytes)
+        
+        if len(in_flight) == 1:
+            relative_path, (file_size, sent) = next(iter(in_flight.items()))
+            progress_percent = (sent / file_size) * 100 if file_size > 0 else 100.0
+            display_path = self.truncate_path(relative_path, 40)
+            return f"  Uploading: {display_path} ({self.format_size(file_size)}) - {progress_percent:.1f}% ({speed_mbps:.2f} MB/s, {total_time_remaining} total remaining)"
+        
+        progress_percent = (bytes_completed / self._upload_total_bytes) * 100 if self._upload_total_bytes > 0 else 0.0
+        return f"  Uploading: {len(in_flight)} files ({self._upload_files_done}/{self._upload_files_total} done) - {progress_percent:.1f}% ({speed_mbps:.2f} MB/s, {total_time_remaining} total remaining)"
     
     def delete_remote_file(self, relative_path: str) -> bool:
         """Delete a file from remote storage."""
         try:
-            encoded_path = urllib.parse.quote(relative_path, safe='/')
-            url = f"{self.config.bunny_storage_url}/{encoded_path}"
+            url = f"{self.config.bunny_storage_url}/{urllib.parse.quote(relative_path, safe='/')}"
             
             response = self.session.delete(url, timeout=30)
             
@@ -639,8 +1104,7 @@ class BunnyStorageSync:
             if not relative_path.endswith('/'):
                 relative_path += '/'
                 
-            encoded_path = urllib.parse.quote(relative_path, safe='/')
-            url = f"{self.config.bunny_storage_url}/{encoded_path}"
+            url = f"{self.config.bunny_storage_url}/{urllib.parse.quote(relative_path, safe='/')}"
             
             response = self.session.delete(url, timeout=30)
             
@@ -661,19 +1125,22 @@ class BunnyStorageSync:
         if not remote_directories:
             return
             
-        # Sort directories by depth (deepest first) to delete from bottom up
-        sorted_dirs = sorted(remote_directories, key=lambda x: x.count('/'), reverse=True)
+        # Sort directories by depth (deepest first) to delete from bottom up; the
+        # decorated tuples compare as ints, then paths for a stable order
+        decorated = sorted((-directory.count('/'), directory) for directory in remote_directories)
+        sorted_dirs = [directory for _, directory in decorated]
         
-        directories_to_delete = []
+        # Collect every directory that still contains a file, walking up from each file
+        # until reaching an ancestor that's already known to be populated
+        populated = set()
+        for file_path in remaining_remote_files:
+            parent = file_path.rpartition('/')[0]
+            while parent and parent not in populated:
+                populated.add(parent)
+                parent = parent.rpartition('/')[0]
         
-        for directory in sorted_dirs:
-            # Check if directory is empty (no files in it)
-            # A directory is empty if no remaining files start with the directory path
-            dir_prefix = directory + '/' if not directory.endswith('/') else directory
-            has_files = any(file_path.startswith(dir_prefix) for file_path in remaining_remote_files)
-            
-            if not has_files:
-                directories_to_delete.append(directory)
+        # A directory is empty if no remaining file lives anywhere below it
+        directories_to_delete = [directory for directory in sorted_dirs if directory.rstrip('/') not in populated]
         
         if directories_to_delete:
             print()
@@ -681,78 +1148,157 @@ class BunnyStorageSync:
             for directory in directories_to_delete:
                 self.delete_remote_directory(directory)
     
-    def get_local_files(self) -> Dict[str, str]:
-        """Get all local files with their full paths."""
+    def _scan_local(self, root: str) -> Iterator[FileEntry]:
+        """Walk a local directory with os.scandir, skipping excluded files. Yields a FileEntry per file."""
+        excluded_files = self.config.excluded_files
+        excluded_pattern = self.config.excluded_pattern
+        quote = urllib.parse.quote
+        # Relative and URL-encoded prefixes are built once per directory, not per file
+        pending = [(root, "", "")]
+        while pending:
+            dir_path, rel_prefix, enc_prefix = pending.pop()
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        # Don't descend into symlinked directories
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append((entry.path, f"{rel_prefix}{name}/", f"{enc_prefix}{quote(name, safe='/')}/"))
+                        elif name in excluded_files or (excluded_pattern is not None and excluded_pattern.match(name)):
+                            # Skip excluded files before they cost a stat call
+                            continue
+                        elif entry.is_file():
+                            file_entry = FileEntry(entry.path, f"{rel_prefix}{name}", f"{enc_prefix}{quote(name, safe='/')}")
+                            try:
+                                file_stat = entry.stat()
+                                file_entry.size = file_stat.st_size
+                                file_entry.mtime = file_stat.st_mtime
+                            except OSError:
+                                pass
+                            yield file_entry
+            except OSError as e:
+                self.print_msg(f"Warning: Cannot read directory '{dir_path}': {e}", Colors.YELLOW)
+    
+    def get_local_files(self) -> Dict[str, FileEntry]:
+        """Get all local files with their full paths and metadata."""
         local_files = {}
-        src_path = Path(self.config.src_dir)
         
-        if not src_path.exists():
+        if not os.path.exists(self.config.src_dir):
             self.print_msg(f"Source directory does not exist: {self.config.src_dir}", Colors.RED)
             return local_files
         
-        # First pass: count total files for progress display
+        # Single pass over the scan generator; the total isn't known up front,
+        # so progress shows a running count
         print("  Scanning local files...", end='', flush=True)
-        all_files = list(src_path.rglob('*'))
-        total_files = sum(1 for f in all_files if f.is_file())
-        
-        if total_files == 0:
-            print(" no files found")
-            return local_files
-        
-        processed_files = 0
+        total_files = 0
         total_size = 0
         last_progress_time = time.time()
         
-        for file_path in all_files:
-            if file_path.is_file():
-                relative_path = str(file_path.relative_to(src_path))
-                
-                # Skip excluded files
-                if not self.should_exclude(relative_path):
-                    local_files[relative_path] = str(file_path)
-                    # Add file size to total
-                    try:
-                        total_size += file_path.stat().st_size
-                    except OSError:
-                        # If we can't get file size, continue without adding to total
-                        pass
-                
-                processed_files += 1
+        for entry in self._scan_local(self.config.src_dir):
+            # Add file size to total (if we could stat the file)
+            if entry.size is not None:
+                total_size += entry.size
+            local_files[entry.rel] = entry
+            
+            total_files += 1
+            
+            # Check the clock every 1000 files and update progress at most every 0.5 seconds
+            if IS_TTY and total_files % 1000 == 0:
                 current_time = time.time()
-                
-                # Update progress every 0.5 seconds or for every 100 files
-                if current_time - last_progress_time >= 0.5 or processed_files % 100 == 0 or processed_files == total_files:
-                    progress_percent = (processed_files / total_files) * 100
-                    print(f"\r\033[K  Scanning local files... {processed_files}/{total_files} ({progress_percent:.1f}%)", end='', flush=True)
+                if current_time - last_progress_time >= 0.5:
+                    print(f"{CLEAR_LINE}  Scanning local files... {total_files} files", end='', flush=True)
                     last_progress_time = current_time
         
-        print(f"\r\033[K  ✓ Found {len(local_files)} local files ({self.format_size(total_size)}, scanned {total_files} total)")
+        if total_files == 0:
+            print(" no files found")
+            return local_files
+        
+        print(f"{CLEAR_LINE}  ✓ Found {len(local_files)} local files ({self.format_size(total_size)}, scanned {total_files} total)")
         return local_files
     
-    def _analyze_single_file(self, relative_path: str, full_path: str, remote_files: Set[str]) -> Optional[Tuple[bool, int, str]]:
+    def get_analysis_workers(self) -> int:
+        """Number of checksum workers: the configured value, else one per CPU core."""
+        if self.config.analysis_workers > 0:
+            return self.config.analysis_workers
+        return os.cpu_count() or 1
+    
+    def compute_checksums_parallel(self, paths: List[Tuple[str, str]], progress_callback=None) -> Tuple[Dict[str, str], Set[str]]:
+        """Calculate checksums for (full_path, relative_path) pairs in parallel. Returns ({relative_path: checksum}, failed relative paths)."""
+        checksums = {}
+        failed = set()
+        if not paths:
+            return checksums, failed
+        
+        tasks = [(full_path, relative_path, self.config.fast_checksum) for full_path, relative_path in paths]
+        max_workers = self.get_analysis_workers()
+        
+        if blake3 is not None and not self.config.fast_checksum:
+            # blake3 already spreads each file over its own thread pool, so threads are enough
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+            chunksize = 1
+        else:
+            # Hashing is CPU-bound, so use processes to sidestep the GIL.
+            # Reporter and delete threads are already running, so don't fork this process.
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method))
+            chunksize = max(1, len(tasks) // (max_workers * 4))
+        
+        with executor:
+            for relative_path, checksum, error in executor.map(_hash_one, tasks, chunksize=chunksize):
+                # Workers don't print; report read errors here
+                if error is not None:
+                    self.print_msg(f"Warning: Cannot read file for checksum '{relative_path}': {error}", Colors.YELLOW)
+                    failed.add(relative_path)
+                else:
+                    checksums[relative_path] = checksum
+                if progress_callback:
+                    progress_callback()
+        
+        return checksums, failed
+    
+    def quick_skip(self, entry: FileEntry) -> bool:
+        """Check if a file is unchanged without reading it: size+mtime match the cache and the remote size matches."""
+        if entry.size is None or self.remote_sizes.get(entry.rel) != entry.size:
+            return False
+        # An old-format cache entry still has to be checked against the file
+        if self._legacy_cache and create_cache_filename(entry.rel) in self._legacy_cache:
+            return False
+        return not self.file_needs_checksum(entry.rel, entry.path, entry)
+    
+    def remote_size_differs(self, relative_path: str, file_size: int) -> bool:
+        """Check if the remote listing reported a different size for a file (False when unknown)."""
+        return self.remote_sizes.get(relative_path, -1) not in (-1, file_size)
+    
+    def _analyze_single_file(self, entry: FileEntry, remote_files: Set[str], local_checksum: Optional[str] = None) -> Optional[Tuple[bool, int, str]]:
         """Analyze a single file for changes. Returns (needs_upload, file_size, checksum) or None if file missing."""
-        # Validate file existence first
+        relative_path, full_path = entry.rel, entry.path
+        
+        # Validate file existence first (the scan's stat already proves it unless it failed)
         try:
-            file_size = os.path.getsize(full_path)
+            file_size = entry.size if entry.size is not None else os.path.getsize(full_path)
         except (FileNotFoundError, OSError) as e:
             self.print_msg(f"Warning: File missing during analysis '{relative_path}': {e}", Colors.YELLOW)
             return None
         
         # Quick check: if file metadata hasn't changed, use cached checksum
-        if not self.file_needs_checksum(relative_path, full_path):
+        if local_checksum is None and not self.file_needs_checksum(relative_path, full_path, entry):
             cached_meta = self.get_cached_metadata(relative_path)
             if cached_meta and 'checksum' in cached_meta:
                 cached_checksum = cached_meta['checksum']
                 if relative_path not in remote_files:
                     return True, file_size, cached_checksum  # File doesn't exist remotely
+                elif self.remote_size_differs(relative_path, file_size):
+                    return True, file_size, cached_checksum  # Remote copy differs in size
                 else:
-                    return False, file_size, cached_checksum  # File unchanged
+                    # File unchanged, unless an older version's cache entry says otherwise
+                    return self._legacy_entry_changed(entry), file_size, cached_checksum
         
-        # Calculate checksum (use fast method for large files if enabled)
-        if self.config.fast_checksum:
-            local_checksum = self.get_file_checksum_fast(full_path)
-        else:
-            local_checksum = self.get_file_checksum(full_path)
+        # Calculate checksum unless it was precomputed (use fast method for large files if enabled)
+        if local_checksum is None:
+            if self.config.fast_checksum:
+                local_checksum = self.get_file_checksum_fast(full_path)
+            else:
+                local_checksum = self.get_file_checksum(full_path)
         
         # If checksum calculation failed, skip this file
         if local_checksum is None:
@@ -770,18 +1316,28 @@ class BunnyStorageSync:
             elif relative_path not in remote_files:
                 # File doesn't exist remotely
                 needs_upload = True
+            elif self.remote_size_differs(relative_path, file_size):
+                # Remote copy differs in size
+                needs_upload = True
         else:
             # No cached checksum
             if relative_path not in remote_files:
                 # File doesn't exist remotely
                 needs_upload = True
+            elif self.remote_size_differs(relative_path, file_size):
+                # Remote copy differs in size, so it can't match the local file
+                needs_upload = True
             else:
-                # File exists remotely but no cache - save checksum for future
+                # File exists remotely with the same size but no cache - save checksum for future
                 pass
         
+        if not needs_upload and self._legacy_entry_changed(entry):
+            # Changed since an older version cached it with another checksum algorithm
+            needs_upload = True
+        
         return needs_upload, file_size, local_checksum
     
-    def analyze_changes(self, local_files: Dict[str, str], remote_files: Set[str]) -> Tuple[List[str], List[str], int]:
+    def analyze_changes(self, local_files: Dict[str, FileEntry], remote_files: Set[str]) -> Tuple[List[str], List[str], int]:
         """Analyze what files need to be uploaded and deleted with parallel processing."""
         files_to_upload = []
         files_to_delete = []
@@ -790,80 +1346,118 @@ class BunnyStorageSync:
         total_local_files = len(local_files)
         
         if total_local_files == 0:
-            # Check which remote files should be deleted
-            for remote_file in remote_files:
-                if self.should_exclude(remote_file):
-                    continue
-                if remote_file not in local_files:
-                    files_to_delete.append(remote_file)
-            return files_to_upload, files_to_delete, total_upload_size
+            # Every non-excluded remote file should be deleted
+            return files_to_upload, self._compute_deletes(local_files, remote_files), total_upload_size
         
         print("  Analyzing file changes...", end='', flush=True)
         
-        if self.config.parallel_analysis and total_local_files > 10:
-            # Use thread pool for parallel processing
-            max_workers = min(4, os.cpu_count() or 1)  # Limit to 4 threads to avoid overwhelming disk I/O
-            processed_files = 0
-            last_progress_time = time.time()
-            progress_lock = threading.Lock()
+        # Deletions don't depend on the analysis, so work them out while files are hashed
+        delete_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        deletes_future = delete_executor.submit(self._compute_deletes, local_files, remote_files)
+        delete_executor.shutdown(wait=False)
+        
+        # Serve cache lookups from memory for the whole pass
+        self.load_cache()
+        
+        # Settle provably unchanged files up front; only the rest need full analysis
+        pending_files = {}
+        for relative_path, entry in local_files.items():
+            if self.quick_skip(entry):
+                self.stats.files_skipped += 1
+            else:
+                pending_files[relative_path] = entry
+        
+        # Progress is counted here and drawn by a reporter thread
+        self._analysis_done = total_local_files - len(pending_files)
+        stop_event = threading.Event()
+        reporter = None
+        if total_local_files > 10 and IS_TTY:
+            reporter = threading.Thread(target=self._analysis_progress_loop, args=(stop_event, total_local_files), daemon=True)
+            reporter.start()
+        
+        try:
+            files_to_upload, total_upload_size = self._analyze_pending(pending_files, remote_files)
+        finally:
+            stop_event.set()
+            if reporter is not None:
+                reporter.join()
+        
+        files_to_delete = deletes_future.result()
+        
+        print(f"{CLEAR_LINE}  ✓ Analysis complete: {len(files_to_upload)} to upload, {len(files_to_delete)} to delete")
+        
+        return files_to_upload, files_to_delete, total_upload_size
+    
+    def _compute_deletes(self, local_files: Dict[str, FileEntry], remote_files: Set[str]) -> List[str]:
+        """Find remote files with no local counterpart, skipping excluded names."""
+        return [remote_file for remote_file in remote_files.difference(local_files) if not self.should_exclude(remote_file)]
+    
+    def _analysis_progress_loop(self, stop_event: threading.Event, total_files: int):
+        """Redraw the analysis progress line every 0.25 seconds until stop_event is set."""
+        while not stop_event.wait(0.25):
+            processed_files = self._analysis_done
+            progress_percent = (processed_files / total_files) * 100
+            print(f"{CLEAR_LINE}  Analyzing file changes... {processed_files}/{total_files} ({progress_percent:.1f}%)", end='', flush=True)
+    
+    def _count_analyzed(self):
+        """Count one analyzed file for the progress reporter."""
+        self._analysis_done += 1
+    
+    def _analyze_pending(self, pending_files: Dict[str, FileEntry], remote_files: Set[str]) -> Tuple[List[str], int]:
+        """Analyze files that weren't settled by quick_skip(). Returns (files_to_upload, total_upload_size)."""
+        files_to_upload = []
+        total_upload_size = 0
+        
+        if self.config.parallel_analysis and len(pending_files) > 10:
+            # Only files whose metadata changed need hashing; the rest resolve from cache
+            entries_to_hash = []
+            for entry in pending_files.values():
+                if self.file_needs_checksum(entry.rel, entry.path, entry):
+                    entries_to_hash.append(entry)
+                else:
+                    self._count_analyzed()
             
-            def update_progress():
-                nonlocal processed_files, last_progress_time
-                with progress_lock:
-                    processed_files += 1
-                    current_time = time.time()
-                    
-                    # Update progress every 0.5 seconds or for every 20 files
-                    if total_local_files > 10 and (current_time - last_progress_time >= 0.5 or processed_files % 20 == 0 or processed_files == total_local_files):
-                        progress_percent = (processed_files / total_local_files) * 100
-                        print(f"\r\033[K  Analyzing file changes... {processed_files}/{total_local_files} ({progress_percent:.1f}%)", end='', flush=True)
-                        last_progress_time = current_time
+            # Start the largest files first so one big file doesn't finish alone at the end
+            entries_to_hash.sort(key=lambda entry: entry.size or 0, reverse=True)
+            files_to_hash = [(entry.path, entry.rel) for entry in entries_to_hash]
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all file analysis tasks
-                future_to_file = {
-                    executor.submit(self._analyze_single_file, rel_path, full_path, remote_files): rel_path
-                    for rel_path, full_path in local_files.items()
-                }
-                
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_file):
-                    relative_path = future_to_file[future]
-                    full_path = local_files[relative_path]
+            # Hash changed files across worker processes
+            checksums, failed = self.compute_checksums_parallel(files_to_hash, self._count_analyzed)
+            
+            for relative_path, entry in pending_files.items():
+                try:
+                    if relative_path in failed:
+                        # Already reported by the worker; don't read the file again
+                        result = None
+                    else:
+                        result = self._analyze_single_file(entry, remote_files, checksums.get(relative_path))
                     
-                    try:
-                        result = future.result()
+                    if result is None:
+                        # File was missing or had errors, skip it
+                        self.stats.files_missing += 1
+                        self.print_msg(f"Skipping missing file: {relative_path}", Colors.YELLOW)
+                    else:
+                        needs_upload, file_size, checksum = result
                         
-                        if result is None:
-                            # File was missing or had errors, skip it
-                            self.stats.files_missing += 1
-                            self.print_msg(f"Skipping missing file: {relative_path}", Colors.YELLOW)
+                        if needs_upload:
+                            files_to_upload.append(relative_path)
+                            total_upload_size += file_size
                         else:
-                            needs_upload, file_size, checksum = result
-                            
-                            if needs_upload:
-                                files_to_upload.append(relative_path)
-                                total_upload_size += file_size
-                            else:
-                                self.stats.files_skipped += 1
-                            
-                            # Save metadata to cache
-                            self.save_metadata_to_cache(relative_path, full_path, checksum)
+                            self.stats.files_skipped += 1
                         
-                    except Exception as e:
-                        self.print_msg(f"Error analyzing {relative_path}: {e}", Colors.YELLOW)
-                        # Don't add missing files to upload queue
-                        self.print_msg(f"Skipping file due to analysis error: {relative_path}", Colors.YELLOW)
+                        # Save metadata to cache
+                        entry.checksum = checksum
+                        self.save_metadata_to_cache(relative_path, entry.path, checksum, entry)
                     
-                    update_progress()
+                except Exception as e:
+                    self.print_msg(f"Error analyzing {relative_path}: {e}", Colors.YELLOW)
+                    # Don't add missing files to upload queue
+                    self.print_msg(f"Skipping file due to analysis error: {relative_path}", Colors.YELLOW)
         else:
             # Sequential processing for smaller file sets or when parallel is disabled
-            processed_files = 0
-            last_progress_time = time.time()
-            
-            for relative_path, full_path in local_files.items():
+            for relative_path, entry in pending_files.items():
                 try:
-                    result = self._analyze_single_file(relative_path, full_path, remote_files)
+                    result = self._analyze_single_file(entry, remote_files)
                     
                     if result is None:
                         # File was missing or had errors, skip it
@@ -879,33 +1473,17 @@ class BunnyStorageSync:
                             self.stats.files_skipped += 1
                         
                         # Save metadata to cache
-                        self.save_metadata_to_cache(relative_path, full_path, checksum)
+                        entry.checksum = checksum
+                        self.save_metadata_to_cache(relative_path, entry.path, checksum, entry)
                     
                 except Exception as e:
                     self.print_msg(f"Error analyzing {relative_path}: {e}", Colors.YELLOW)
                     # Don't add missing files to upload queue
                     self.print_msg(f"Skipping file due to analysis error: {relative_path}", Colors.YELLOW)
                 
-                processed_files += 1
-                current_time = time.time()
-                
-                # Update progress every 0.5 seconds or for every 50 files
-                if total_local_files > 10 and (current_time - last_progress_time >= 0.5 or processed_files % 50 == 0 or processed_files == total_local_files):
-                    progress_percent = (processed_files / total_local_files) * 100
-                    print(f"\r\033[K  Analyzing file changes... {processed_files}/{total_local_files} ({progress_percent:.1f}%)", end='', flush=True)
-                    last_progress_time = current_time
-        
-        print(f"\r\033[K  ✓ Analysis complete: {len(files_to_upload)} to upload, {len(files_to_delete)} to delete")
+                self._count_analyzed()
         
-        # Check which remote files should be deleted
-        for remote_file in remote_files:
-            if self.should_exclude(remote_file):
-                continue
-                
-            if remote_file not in local_files:
-                files_to_delete.append(remote_file)
-        
-        return files_to_upload, files_to_delete, total_upload_size
+        return files_to_upload, total_upload_size
     
     def confirm_changes(self, files_to_upload: List[str], files_to_delete: List[str], upload_size: int) -> bool:
         """Ask user to confirm changes."""
@@ -936,7 +1514,10 @@ class BunnyStorageSync:
         self.print_msg(f"Source: {self.config.src_dir}", Colors.BLUE)
         self.print_msg(f"Destination: {self.config.bunny_storage_url}", Colors.BLUE)
         # self.print_msg(f"Excluded files: {', '.join(self.config.excluded_files)}", Colors.BLUE)
-        self.print_msg(f"Upload chunk size: 256 KB", Colors.BLUE)
+        self.print_msg(f"Upload chunk size: {UPLOAD_CHUNK_SIZE // 1024} KB", Colors.BLUE)
+        if FULL_CHECKSUM_ALGO == "md5" and OPENSSL_VERSION_INFO is not None and OPENSSL_VERSION_INFO < (1, 1, 1):
+            self.print_msg(f"Warning: Python is linked against {ssl.OPENSSL_VERSION}; MD5 checksums will be slow "
+                           f"(install blake3 or use a Python build with OpenSSL 1.1.1+)", Colors.YELLOW)
         
         # Show option status early
         if dry_run:
@@ -951,10 +1532,15 @@ class BunnyStorageSync:
         # Get local and remote files
         self.print_msg("Analyzing files...")
         local_files = self.get_local_files()
-        remote_files, remote_directories = self.get_remote_files()
+        try:
+            remote_files, remote_directories = self.get_remote_files()
+        except Exception:
+            self.print_msg("Sync aborted: the remote file list could not be fetched completely", Colors.RED)
+            return
         
-        # Analyze what changes are needed
-        files_to_upload, files_to_delete, upload_size = self.analyze_changes(local_files, remote_files)
+        # Analyze what changes are needed (cache updates are committed together)
+        with self.cache_transaction():
+            files_to_upload, files_to_delete, upload_size = self.analyze_changes(local_files, remote_files)
         print()
         
         # Ask for confirmation (unless skipped)
@@ -972,73 +1558,90 @@ class BunnyStorageSync:
         self.print_msg("Proceeding with sync...", Colors.GREEN)
         print()
         
-        # Upload files
-        if files_to_upload:
-            # Validate files still exist and calculate total upload size
-            validated_files = []
-            total_upload_size = 0
-            missing_files = []
+        # Post-upload cache updates and removals are committed together
+        with self.cache_transaction():
+            # Upload files
+            if files_to_upload:
+                # Validate files still exist and calculate total upload size
+                validated_files = []
+                validated_sizes = {}
+                total_upload_size = 0
+                missing_files = []
             
-            for relative_path in files_to_upload:
-                full_path = local_files[relative_path]
-                try:
-                    file_size = os.path.getsize(full_path)
-                    validated_files.append(relative_path)
-                    total_upload_size += file_size
-                except (FileNotFoundError, OSError) as e:
-                    missing_files.append(relative_path)
-                    self.print_msg(f"File missing before upload '{relative_path}': {e}", Colors.YELLOW)
+                for relative_path in files_to_upload:
+                    full_path = local_files[relative_path].path
+                    try:
+                        file_size = os.path.getsize(full_path)
+                        validated_files.append(relative_path)
+                        validated_sizes[relative_path] = file_size
+                        total_upload_size += file_size
+                    except (FileNotFoundError, OSError) as e:
+                        missing_files.append(relative_path)
+                        self.print_msg(f"File missing before upload '{relative_path}': {e}", Colors.YELLOW)
                         
-            if missing_files:
-                self.stats.files_missing += len(missing_files)
-                self.print_msg(f"Skipping {len(missing_files)} missing files that were queued for upload", Colors.YELLOW)
+                if missing_files:
+                    self.stats.files_missing += len(missing_files)
+                    self.print_msg(f"Skipping {len(missing_files)} missing files that were queued for upload", Colors.YELLOW)
             
-            if validated_files:
-                total_files_to_upload = len(validated_files)
-                
-                for file_index, relative_path in enumerate(validated_files):
-                    full_path = local_files[relative_path]
-                    
+                if validated_files:
                     if dry_run:
-                        self.print_msg(f"DRY RUN - Would upload: {relative_path} ({self.format_size(os.path.getsize(full_path))})", Colors.BLUE)
-                        self.stats.files_uploaded += 1
-                        self.stats.total_bytes_uploaded += os.path.getsize(full_path)
+                        for relative_path in validated_files:
+                            file_size = validated_sizes[relative_path]
+                            self.print_msg(f"DRY RUN - Would upload: {relative_path} ({self.format_size(file_size)})", Colors.BLUE)
+                            self.stats.files_uploaded += 1
+                            self.stats.total_bytes_uploaded += file_size
                     else:
-                        success = self.upload_file(full_path, relative_path, file_index, total_files_to_upload, total_upload_size)
-                        
-                        if success:
-                            # Update cache with new checksum and metadata
-                            if self.config.fast_checksum:
-                                checksum = self.get_file_checksum_fast(full_path)
-                            else:
-                                checksum = self.get_file_checksum(full_path)
+                        # Start the largest files first; smaller uploads fill the other slots around them
+                        upload_items = [local_files[relative_path] for relative_path in validated_files]
+                        upload_items.sort(key=lambda entry: validated_sizes[entry.rel], reverse=True)
+                    
+                        for relative_path, success in self.upload_many(upload_items, total_upload_size, max(1, self.config.upload_concurrency)):
+                            if success:
+                                entry = local_files[relative_path]
+                                try:
+                                    file_stat = os.stat(entry.path)
+                                except OSError:
+                                    continue
                             
-                            if checksum is not None:
-                                self.save_metadata_to_cache(relative_path, full_path, checksum)
+                                # Reuse the checksum from analysis unless the file changed since the scan
+                                checksum = entry.checksum
+                                if checksum is None or file_stat.st_size != entry.size or file_stat.st_mtime != entry.mtime:
+                                    if self.config.fast_checksum:
+                                        checksum = self.get_file_checksum_fast(entry.path)
+                                    else:
+                                        checksum = self.get_file_checksum(entry.path)
+                            
+                                # Update cache with checksum and metadata
+                                if checksum is not None:
+                                    try:
+                                        self._save_cache_row(relative_path, file_stat.st_size, file_stat.st_mtime, checksum)
+                                        self.drop_legacy_entry(relative_path)
+                                    except sqlite3.Error as e:
+                                        self.print_msg(f"Warning: Could not save metadata to cache: {e}", Colors.YELLOW)
         
-        # Delete remote files
-        if files_to_delete:
-            print()
-            if dry_run:
-                self.print_msg("DRY RUN - Would remove remote files...")
-            else:
-                self.print_msg("Removing remote files...")
-            for relative_path in files_to_delete:
+            # Delete remote files
+            if files_to_delete:
+                print()
                 if dry_run:
-                    self.print_msg(f"DRY RUN - Would delete: {relative_path}", Colors.BLUE)
-                    self.stats.files_deleted += 1
+                    self.print_msg("DRY RUN - Would remove remote files...")
                 else:
-                    success = self.delete_remote_file(relative_path)
-                    if success:
-                        self.remove_from_cache(relative_path)
-                        # Remove from remote_files set so we can identify empty directories
-                        remote_files.discard(relative_path)
-        
-        # Clean up empty directories
-        if not dry_run:
-            self.cleanup_empty_directories(remote_directories, remote_files)
-        elif files_to_delete:  # Only show dry-run message if there were files to delete
-            self.print_msg("DRY RUN - Would clean up empty directories", Colors.BLUE)
+                    self.print_msg("Removing remote files...")
+                for relative_path in files_to_delete:
+                    if dry_run:
+                        self.print_msg(f"DRY RUN - Would delete: {relative_path}", Colors.BLUE)
+                        self.stats.files_deleted += 1
+                    else:
+                        success = self.delete_remote_file(relative_path)
+                        if success:
+                            self.remove_from_cache(relative_path)
+                            # Remove from remote_files set so we can identify empty directories
+                            remote_files.discard(relative_path)
+        
+            # Clean up empty directories
+            if not dry_run:
+                self.cleanup_empty_directories(remote_directories, remote_files)
+            elif files_to_delete:  # Only show dry-run message if there were files to delete
+                self.print_msg("DRY RUN - Would clean up empty directories", Colors.BLUE)
         
         # Print summary
         self.print_summary(dry_run=dry_run)
@@ -1068,8 +1671,9 @@ class BunnyStorageSync:
             duration_str = f"{minutes:02d}m:{seconds:02d}s"
         
         # Calculate average speed
-        if self.stats.files_uploaded > 0 and self.stats.total_upload_time > 0:
-            avg_speed = self.calc_speed(self.stats.total_bytes_uploaded, self.stats.total_upload_time)
+        # Uploads overlap, so measure wall-clock time from the first byte to the last completion
+        if self.stats.files_uploaded > 0 and self.stats.first_byte_upload_time is not None and self.stats.last_upload_end_time is not None:
+            avg_speed = self.calc_speed(self.stats.total_bytes_uploaded, self.stats.last_upload_end_time - self.stats.first_byte_upload_time)
         else:
             avg_speed = "N/A"
         
@@ -1091,6 +1695,16 @@ class BunnyStorageSync:
         print()
         self.print_msg(f"=== End of BunnyHop v{__version__} ===", Colors.BOLD)
 
+def _hash_one(task: Tuple[str, str, bool]) -> Tuple[str, Optional[str], Optional[str]]:
+    """Calculate the checksum of one file in a worker. Returns (relative_path, checksum, error message)."""
+    full_path, relative_path, fast_checksum = task
+    try:
+        if fast_checksum:
+            return relative_path, compute_file_checksum_fast(full_path), None
+        return relative_path, compute_file_checksum(full_path), None
+    except Exception as e:
+        return relative_path, None, str(e)
+
 def main():
     parser = argparse.ArgumentParser(description=f'BunnyHop - Bunny.net storage zone sync tool (v{__version__})')
     parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')